@@ -1,34 +1,42 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.middleware.gzip import GZipMiddleware
+from pymongo import AsyncMongoClient, UpdateOne
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import uuid
+import asyncio
+from functools import lru_cache
 from datetime import datetime, date, timedelta
 import bcrypt
 import jwt
+import hmac
+import hashlib
+import base64
+from cachetools import TTLCache
 import json
+import orjson
 import io
 import csv
-from collections import defaultdict
 import calendar
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection (PyMongo's native asyncio client; Motor only wrapped
+# blocking calls in a threadpool)
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncMongoClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
-# Create the main app without a prefix
-app = FastAPI()
+# Create the main app without a prefix; serialize responses with orjson
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -145,11 +153,20 @@ class BudgetAlert(BaseModel):
     is_read: bool = False
 
 # Auth Helper Functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def hash_password(password: str) -> str:
+    # bcrypt is CPU-bound and takes hundreds of ms; run it in the threadpool
+    # so the event loop keeps serving other requests
+    loop = asyncio.get_running_loop()
+    hashed = await loop.run_in_executor(
+        None, bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt()
+    )
+    return hashed.decode('utf-8')
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8')
+    )
 
 def create_jwt_token(user_id: str) -> str:
     payload = {
@@ -158,111 +175,193 @@ def create_jwt_token(user_id: str) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
+JWT_SIG_KEY = JWT_SECRET.encode('utf-8')
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+def decode_jwt_token(token: str) -> dict:
+    """Verify and decode our fixed-layout HS256 tokens directly.
+
+    Tokens are always issued by create_jwt_token, so skip PyJWT's algorithm
+    dispatch and claim validation: check the HMAC over the signed prefix,
+    parse the payload, and enforce exp."""
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("user_id")
-        if not user_id:
+        header_b64, payload_b64, sig_b64 = token.split(".", 2)
+        expected = hmac.new(
+            JWT_SIG_KEY, f"{header_b64}.{payload_b64}".encode('utf-8'), hashlib.sha256
+        ).digest()
+        if not hmac.compare_digest(expected, _b64url_decode(sig_b64)):
             raise HTTPException(status_code=401, detail="Invalid token")
-        
-        user = await db.users.find_one({"id": user_id})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        return User(**user)
-    except jwt.ExpiredSignatureError:
+        payload = json.loads(_b64url_decode(payload_b64))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    exp = payload.get("exp")
+    if exp is not None and exp <= datetime.utcnow().timestamp():
         raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.InvalidTokenError:
+
+    return payload
+
+# Cache token -> User so authenticated requests skip the decode + Mongo
+# lookup; the short TTL bounds how stale a cached user can get
+user_cache = TTLCache(maxsize=10_000, ttl=60)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    cached_user = user_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
+    payload = decode_jwt_token(token)
+    user_id = payload.get("user_id")
+    if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    user = await db.users.find_one({"id": user_id})
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    current_user = User(**user)
+    user_cache[token] = current_user
+    return current_user
+
 # Helper Functions
-def get_date_range(period: str, custom_start: str = None, custom_end: str = None):
-    """Get start and end dates for different periods"""
-    today = date.today()
-    
+@lru_cache(maxsize=12)
+def _month_bounds(year: int, month: int):
+    """First and last day of a month; callers only ever ask for the current one"""
+    last_day = calendar.monthrange(year, month)[1]
+    return date(year, month, 1), date(year, month, last_day)
+
+@lru_cache(maxsize=32)
+def _range_for(period: str, today_iso: str):
+    """Compute (start, end) for a period; pure, so cached per calendar day"""
+    today = date.fromisoformat(today_iso)
+
     if period == "today":
         return str(today), str(today)
     elif period == "week":
         start = today - timedelta(days=today.weekday())
         end = start + timedelta(days=6)
         return str(start), str(end)
-    elif period == "month":
-        start = today.replace(day=1)
-        next_month = today.replace(day=28) + timedelta(days=4)
-        end = next_month - timedelta(days=next_month.day)
-        return str(start), str(end)
     elif period == "year":
         start = today.replace(month=1, day=1)
         end = today.replace(month=12, day=31)
         return str(start), str(end)
-    elif period == "custom" and custom_start and custom_end:
-        return custom_start, custom_end
     else:
-        # Default to current month
-        start = today.replace(day=1)
-        next_month = today.replace(day=28) + timedelta(days=4)
-        end = next_month - timedelta(days=next_month.day)
+        # "month" and the default both mean the current month
+        start, end = _month_bounds(today.year, today.month)
         return str(start), str(end)
 
+def get_date_range(period: str, custom_start: str = None, custom_end: str = None):
+    """Get start and end dates for different periods"""
+    if period == "custom" and custom_start and custom_end:
+        return custom_start, custom_end
+    return _range_for(period, date.today().isoformat())
+
 async def check_budget_alerts(user_id: str):
-    """Check for budget alerts and create notifications"""
-    budgets = await db.budgets.find({"user_id": user_id, "is_active": True}).to_list(100)
-    
-    for budget in budgets:
-        # Calculate current spending for this budget period
-        expenses = await db.expenses.find({
+    """Check for budget alerts and create notifications.
+
+    Returns the user's budgets with refreshed current_spent values."""
+    budgets = await db.budgets.find({"user_id": user_id}).to_list(100)
+    active_budgets = [budget for budget in budgets if budget.get("is_active")]
+    if not active_budgets:
+        return budgets
+
+    # Sum spending for every budget window in a single aggregation
+    # instead of one expenses query per budget
+    facets = {
+        budget["id"]: [
+            {"$match": {
+                "category": budget["category"],
+                "date": {"$gte": budget["start_date"], "$lte": budget["end_date"]}
+            }},
+            {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+        ]
+        for budget in active_budgets
+    }
+    pipeline = [
+        {"$match": {
             "user_id": user_id,
-            "category": budget["category"],
             "type": "expense",
-            "date": {"$gte": budget["start_date"], "$lte": budget["end_date"]}
-        }).to_list(1000)
-        
-        current_spent = sum(expense["amount"] for expense in expenses)
-        percentage = (current_spent / budget["limit_amount"]) * 100 if budget["limit_amount"] > 0 else 0
-        
+            "$or": [{
+                "category": budget["category"],
+                "date": {"$gte": budget["start_date"], "$lte": budget["end_date"]}
+            } for budget in active_budgets]
+        }},
+        {"$facet": facets}
+    ]
+    cursor = await db.expenses.aggregate(pipeline)
+    results = await cursor.to_list(1)
+    spent_by_budget = {
+        budget_id: (rows[0]["total"] if rows else 0.0)
+        for budget_id, rows in results[0].items()
+    }
+
+    budget_updates = []
+    for budget in active_budgets:
+        current_spent = spent_by_budget.get(budget["id"], 0.0)
+        budget["current_spent"] = current_spent
+
         # Update budget with current spending
-        await db.budgets.update_one(
+        budget_updates.append(UpdateOne(
             {"id": budget["id"]},
             {"$set": {"current_spent": current_spent}}
-        )
-        
-        # Check for alerts
-        alert_created = False
-        if percentage >= 100 and not await db.budget_alerts.find_one({
-            "budget_id": budget["id"], 
-            "alert_type": "exceeded",
-            "created_at": {"$gte": datetime.utcnow() - timedelta(days=1)}
-        }):
+        ))
+
+    new_alerts = await collect_new_alerts(user_id, active_budgets)
+
+    # Apply all spending updates and new alerts in one round trip each
+    await db.budgets.bulk_write(budget_updates)
+    if new_alerts:
+        await db.budget_alerts.insert_many(new_alerts)
+
+    return budgets
+
+async def collect_new_alerts(user_id: str, budgets: list) -> list:
+    """Build alert docs for budgets crossing 80%/100% without a recent alert"""
+    if not budgets:
+        return []
+
+    # Fetch recent alerts for all budgets at once for deduplication
+    recent_alerts = await db.budget_alerts.find({
+        "budget_id": {"$in": [budget["id"] for budget in budgets]},
+        "created_at": {"$gte": datetime.utcnow() - timedelta(days=1)}
+    }).to_list(1000)
+    recently_alerted = {(alert["budget_id"], alert["alert_type"]) for alert in recent_alerts}
+
+    new_alerts = []
+    for budget in budgets:
+        current_spent = budget.get("current_spent", 0.0)
+        percentage = (current_spent / budget["limit_amount"]) * 100 if budget["limit_amount"] > 0 else 0
+
+        if percentage >= 100 and (budget["id"], "exceeded") not in recently_alerted:
             # Budget exceeded
-            alert = BudgetAlert(
-                id=str(uuid.uuid4()),
-                user_id=user_id,
-                budget_id=budget["id"],
-                message=f"Budget exceeded for {budget['category']}! Spent ${current_spent:.2f} of ${budget['limit_amount']:.2f}",
-                alert_type="exceeded",
-                percentage=percentage,
-                created_at=datetime.utcnow()
-            )
-            await db.budget_alerts.insert_one(alert.dict())
-            alert_created = True
-            
-        elif percentage >= 80 and not alert_created and not await db.budget_alerts.find_one({
-            "budget_id": budget["id"], 
-            "alert_type": "warning",
-            "created_at": {"$gte": datetime.utcnow() - timedelta(days=1)}
-        }):
+            new_alerts.append({
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "budget_id": budget["id"],
+                "message": f"Budget exceeded for {budget['category']}! Spent ${current_spent:.2f} of ${budget['limit_amount']:.2f}",
+                "alert_type": "exceeded",
+                "percentage": percentage,
+                "created_at": datetime.utcnow(),
+                "is_read": False
+            })
+
+        elif percentage >= 80 and (budget["id"], "warning") not in recently_alerted:
             # Budget warning (80% threshold)
-            alert = BudgetAlert(
-                id=str(uuid.uuid4()),
-                user_id=user_id,
-                budget_id=budget["id"],
-                message=f"Budget warning for {budget['category']}! {percentage:.1f}% spent (${current_spent:.2f} of ${budget['limit_amount']:.2f})",
-                alert_type="warning",
-                percentage=percentage,
-                created_at=datetime.utcnow()
-            )
-            await db.budget_alerts.insert_one(alert.dict())
+            new_alerts.append({
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "budget_id": budget["id"],
+                "message": f"Budget warning for {budget['category']}! {percentage:.1f}% spent (${current_spent:.2f} of ${budget['limit_amount']:.2f})",
+                "alert_type": "warning",
+                "percentage": percentage,
+                "created_at": datetime.utcnow(),
+                "is_read": False
+            })
+
+    return new_alerts
 
 # # Auth Routes
 # @api_router.post("/auth/register")
@@ -271,7 +370,7 @@ async def check_budget_alerts(user_id: str):
 #     if existing_user:
 #         raise HTTPException(status_code=400, detail="Username already exists")
     
-#     hashed_password = hash_password(user_data.password)
+#     hashed_password = await hash_password(user_data.password)
 #     user = User(
 #         id=str(uuid.uuid4()),
 #         username=user_data.username, 
@@ -301,34 +400,48 @@ async def register(user_data: UserCreate):
         logger.warning("Username already exists")
         raise HTTPException(status_code=400, detail="Username already exists")
 
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     logger.info("Password hashed successfully")
 
-    user = User(
-        id=str(uuid.uuid4()),
-        username=user_data.username, 
-        email=user_data.email,
-        created_at=datetime.utcnow()
-    )
-    user_dict = user.dict()
-    user_dict["password"] = hashed_password
-    
+    user_dict = {
+        "id": str(uuid.uuid4()),
+        "username": user_data.username,
+        "email": user_data.email,
+        "created_at": datetime.utcnow(),
+        "password": hashed_password
+    }
+
     result = await db.users.insert_one(user_dict)
     logger.info(f"User inserted with _id: {result.inserted_id}")
+    user_dict.pop("_id", None)
 
-    token = create_jwt_token(user.id)
+    token = create_jwt_token(user_dict["id"])
     return {"message": "User created successfully", "token": token, "user": user_dict}
 
 
+# Track failed logins per username so repeated bad attempts are rejected
+# before paying the bcrypt verification cost
+login_failures = TTLCache(maxsize=10_000, ttl=60)
+MAX_LOGIN_FAILURES = 5
+
+def _record_login_failure(username: str):
+    login_failures[username] = login_failures.get(username, 0) + 1
+
 @api_router.post("/auth/login")
 async def login(login_data: UserLogin):
+    if login_failures.get(login_data.username, 0) >= MAX_LOGIN_FAILURES:
+        raise HTTPException(status_code=429, detail="Too many failed login attempts, try again later")
+
     user = await db.users.find_one({"username": login_data.username})
     if not user:
+        _record_login_failure(login_data.username)
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    
-    if not verify_password(login_data.password, user["password"]):
+
+    if not await verify_password(login_data.password, user["password"]):
+        _record_login_failure(login_data.username)
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    
+
+    login_failures.pop(login_data.username, None)
     token = create_jwt_token(user["id"])
     
     return {
@@ -342,21 +455,30 @@ async def login(login_data: UserLogin):
     }
 
 # Categories Routes
+
+# The predefined entries are identical for every user, so build them once
+# at import time instead of on every request
+PREDEFINED_CATEGORY_LIST = [{"name": name, "icon": icon, "is_custom": False}
+                            for name, icon in PREDEFINED_CATEGORIES.items()]
+
 @api_router.get("/categories")
-async def get_categories(current_user: User = Depends(get_current_user)):
+async def get_categories(response: Response, current_user: User = Depends(get_current_user)):
     custom_categories = await db.custom_categories.find({"user_id": current_user.id}).to_list(100)
-    
-    predefined_list = [{"name": name, "icon": icon, "is_custom": False} 
-                      for name, icon in PREDEFINED_CATEGORIES.items()]
-    
-    custom_list = [{"name": cat["name"], "icon": cat.get("icon", "📦"), 
-                   "goal": cat.get("goal"), "is_custom": True, "id": cat["id"]} 
+
+    custom_list = [{"name": cat["name"], "icon": cat.get("icon", "📦"),
+                   "goal": cat.get("goal"), "is_custom": True, "id": cat["id"]}
                   for cat in custom_categories]
-    
-    all_categories = predefined_list + custom_list
-    
+
+    all_categories = PREDEFINED_CATEGORY_LIST + custom_list
+
+    # Categories change rarely; let clients skip the round trip briefly.
+    # Vary on Authorization so one user's cached list is never served to
+    # another account on the same machine
+    response.headers["Cache-Control"] = "private, max-age=30"
+    response.headers["Vary"] = "Authorization"
+
     return {
-        "predefined": predefined_list,
+        "predefined": PREDEFINED_CATEGORY_LIST,
         "custom": custom_list,
         "all": all_categories
     }
@@ -373,16 +495,17 @@ async def create_category(category_data: CategoryCreate, current_user: User = De
     if category_data.name in PREDEFINED_CATEGORIES:
         raise HTTPException(status_code=400, detail="Category already exists in predefined list")
     
-    category = CustomCategory(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id, 
-        name=category_data.name,
-        icon=category_data.icon or "📦",
-        goal=category_data.goal,
-        created_at=datetime.utcnow()
-    )
-    await db.custom_categories.insert_one(category.dict())
-    
+    category = {
+        "id": str(uuid.uuid4()),
+        "user_id": current_user.id,
+        "name": category_data.name,
+        "icon": category_data.icon or "📦",
+        "goal": category_data.goal,
+        "created_at": datetime.utcnow()
+    }
+    await db.custom_categories.insert_one(category)
+    category.pop("_id", None)
+
     return {"message": "Category created successfully", "category": category}
 
 @api_router.put("/categories/{category_id}")
@@ -410,15 +533,12 @@ async def update_category(
 # Budget Routes
 @api_router.get("/budgets")
 async def get_budgets(current_user: User = Depends(get_current_user)):
-    budgets = await db.budgets.find({"user_id": current_user.id}).to_list(100)
-    
-    # Update current spending for each budget
+    # Refresh spending and alerts once; reuse the budgets it already fetched.
+    # Return the raw docs - input models already validated everything on write
+    budgets = await check_budget_alerts(current_user.id)
     for budget in budgets:
-        await check_budget_alerts(current_user.id)
-    
-    # Fetch updated budgets
-    updated_budgets = await db.budgets.find({"user_id": current_user.id}).to_list(100)
-    return [Budget(**budget) for budget in updated_budgets]
+        budget.pop("_id", None)
+    return budgets
 
 @api_router.post("/budgets")
 async def create_budget(budget_data: BudgetCreate, current_user: User = Depends(get_current_user)):
@@ -426,9 +546,7 @@ async def create_budget(budget_data: BudgetCreate, current_user: User = Depends(
     today = date.today()
     
     if budget_data.period == "monthly":
-        start_date = today.replace(day=1)
-        next_month = today.replace(day=28) + timedelta(days=4)
-        end_date = next_month - timedelta(days=next_month.day)
+        start_date, end_date = _month_bounds(today.year, today.month)
     else:  # weekly
         start_date = today - timedelta(days=today.weekday())
         end_date = start_date + timedelta(days=6)
@@ -443,18 +561,21 @@ async def create_budget(budget_data: BudgetCreate, current_user: User = Depends(
     if existing_budget:
         raise HTTPException(status_code=400, detail="Active budget already exists for this category and period")
     
-    budget = Budget(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        category=budget_data.category,
-        limit_amount=budget_data.limit_amount,
-        period=budget_data.period,
-        start_date=str(start_date),
-        end_date=str(end_date),
-        created_at=datetime.utcnow()
-    )
-    
-    await db.budgets.insert_one(budget.dict())
+    budget = {
+        "id": str(uuid.uuid4()),
+        "user_id": current_user.id,
+        "category": budget_data.category,
+        "limit_amount": budget_data.limit_amount,
+        "period": budget_data.period,
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "current_spent": 0.0,
+        "is_active": True,
+        "created_at": datetime.utcnow()
+    }
+
+    await db.budgets.insert_one(budget)
+    budget.pop("_id", None)
     return {"message": "Budget created successfully", "budget": budget}
 
 @api_router.put("/budgets/{budget_id}")
@@ -490,8 +611,8 @@ async def delete_budget(budget_id: str, current_user: User = Depends(get_current
 @api_router.get("/budgets/alerts")
 async def get_budget_alerts(current_user: User = Depends(get_current_user)):
     await check_budget_alerts(current_user.id)
-    alerts = await db.budget_alerts.find({"user_id": current_user.id}).sort("created_at", -1).to_list(50)
-    return [BudgetAlert(**alert) for alert in alerts]
+    alerts = await db.budget_alerts.find({"user_id": current_user.id}, {"_id": 0}).sort("created_at", -1).to_list(50)
+    return alerts
 
 @api_router.put("/budgets/alerts/{alert_id}/read")
 async def mark_alert_read(alert_id: str, current_user: User = Depends(get_current_user)):
@@ -507,36 +628,88 @@ async def mark_alert_read(alert_id: str, current_user: User = Depends(get_curren
 # Expense Routes
 @api_router.post("/expenses")
 async def create_expense(expense_data: ExpenseCreate, current_user: User = Depends(get_current_user)):
-    expense = Expense(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
-        title=expense_data.title,
-        amount=expense_data.amount,
-        category=expense_data.category,
-        type=expense_data.type,
-        description=expense_data.description,
-        date=expense_data.date or str(date.today()),
-        created_at=datetime.utcnow()
-    )
-    
-    await db.expenses.insert_one(expense.dict())
-    
-    # Check for budget alerts after adding expense
+    expense = {
+        "id": str(uuid.uuid4()),
+        "user_id": current_user.id,
+        "title": expense_data.title,
+        "amount": expense_data.amount,
+        "category": expense_data.category,
+        "type": expense_data.type,
+        "description": expense_data.description,
+        "date": expense_data.date or str(date.today()),
+        "created_at": datetime.utcnow()
+    }
+
+    await db.expenses.insert_one(expense)
+    expense.pop("_id", None)
+
+    # Bump matching budgets by the new amount instead of recomputing all
+    # spending from scratch; full recomputation stays on update/delete
     if expense_data.type == "expense":
-        await check_budget_alerts(current_user.id)
-    
+        budget_filter = {
+            "user_id": current_user.id,
+            "category": expense["category"],
+            "is_active": True,
+            "start_date": {"$lte": expense["date"]},
+            "end_date": {"$gte": expense["date"]}
+        }
+        result = await db.budgets.update_many(
+            budget_filter,
+            {"$inc": {"current_spent": expense["amount"]}}
+        )
+
+        # Only the budgets just bumped can newly cross an alert threshold
+        if result.modified_count:
+            budgets = await db.budgets.find(budget_filter).to_list(100)
+            new_alerts = await collect_new_alerts(current_user.id, budgets)
+            if new_alerts:
+                await db.budget_alerts.insert_many(new_alerts)
+
     return {"message": "Expense created successfully", "expense": expense}
 
+@api_router.post("/expenses/batch")
+async def create_expenses_batch(expenses_data: List[ExpenseCreate], current_user: User = Depends(get_current_user)):
+    if not expenses_data:
+        raise HTTPException(status_code=400, detail="No expenses provided")
+
+    expenses = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": current_user.id,
+            "title": expense_data.title,
+            "amount": expense_data.amount,
+            "category": expense_data.category,
+            "type": expense_data.type,
+            "description": expense_data.description,
+            "date": expense_data.date or str(date.today()),
+            "created_at": datetime.utcnow()
+        }
+        for expense_data in expenses_data
+    ]
+
+    await db.expenses.insert_many(expenses, ordered=False)
+
+    # One spending/alert refresh for the whole batch instead of per row
+    if any(expense["type"] == "expense" for expense in expenses):
+        await check_budget_alerts(current_user.id)
+
+    return {
+        "message": f"{len(expenses)} expenses created successfully",
+        "ids": [expense["id"] for expense in expenses]
+    }
+
 @api_router.get("/expenses")
 async def get_expenses(
     category: Optional[str] = None,
     type: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ):
     filter_query = {"user_id": current_user.id}
-    
+
     if category:
         filter_query["category"] = category
     if type:
@@ -548,9 +721,32 @@ async def get_expenses(
             filter_query["date"]["$lte"] = end_date
         else:
             filter_query["date"] = {"$lte": end_date}
-    
-    expenses = await db.expenses.find(filter_query).sort("date", -1).to_list(1000)
-    return [Expense(**expense) for expense in expenses]
+
+    # Keyset pagination on (date, id) so deep pages cost the same as page one
+    if cursor:
+        try:
+            cursor_date, cursor_id = cursor.split("|", 1)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        filter_query["$or"] = [
+            {"date": {"$lt": cursor_date}},
+            {"date": cursor_date, "id": {"$lt": cursor_id}}
+        ]
+
+    limit = max(1, min(limit, 1000))
+    expenses = await db.expenses.find(filter_query).sort([("date", -1), ("id", -1)]).to_list(limit)
+
+    next_cursor = None
+    if len(expenses) == limit:
+        next_cursor = f"{expenses[-1]['date']}|{expenses[-1]['id']}"
+
+    for expense in expenses:
+        expense.pop("_id", None)
+
+    return {
+        "items": expenses,
+        "next_cursor": next_cursor
+    }
 
 @api_router.put("/expenses/{expense_id}")
 async def update_expense(
@@ -579,7 +775,10 @@ async def delete_expense(expense_id: str, current_user: User = Depends(get_curre
     result = await db.expenses.delete_one({"id": expense_id, "user_id": current_user.id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Expense not found")
-    
+
+    # Recompute budget spending now that an expense is gone
+    await check_budget_alerts(current_user.id)
+
     return {"message": "Expense deleted successfully"}
 
 # Analytics Routes
@@ -598,25 +797,37 @@ async def get_summary(
     if start_date and end_date:
         date_filter["date"] = {"$gte": start_date, "$lte": end_date}
     
-    all_transactions = await db.expenses.find(date_filter).to_list(1000)
-    
-    total_expenses = sum(t["amount"] for t in all_transactions if t["type"] == "expense")
-    total_income = sum(t["amount"] for t in all_transactions if t["type"] == "income")
-    balance = total_income - total_expenses
-    
-    # Category breakdown for expenses
+    # Group totals server-side so only aggregated rows cross the wire
+    cursor = await db.expenses.aggregate([
+        {"$match": date_filter},
+        {"$group": {
+            "_id": {"type": "$type", "category": "$category"},
+            "amount": {"$sum": "$amount"},
+            "count": {"$sum": 1}
+        }}
+    ])
+    rows = await cursor.to_list(1000)
+
+    total_expenses = 0.0
+    total_income = 0.0
+    transaction_count = 0
     category_totals = {}
-    for transaction in all_transactions:
-        if transaction["type"] == "expense":
-            category = transaction["category"]
-            category_totals[category] = category_totals.get(category, 0) + transaction["amount"]
-    
+    for row in rows:
+        transaction_count += row["count"]
+        if row["_id"]["type"] == "expense":
+            total_expenses += row["amount"]
+            category = row["_id"]["category"]
+            category_totals[category] = category_totals.get(category, 0) + row["amount"]
+        else:
+            total_income += row["amount"]
+    balance = total_income - total_expenses
+
     return {
         "total_expenses": total_expenses,
         "total_income": total_income,
         "balance": balance,
         "category_breakdown": category_totals,
-        "transaction_count": len(all_transactions),
+        "transaction_count": transaction_count,
         "period": period,
         "start_date": start_date,
         "end_date": end_date
@@ -637,36 +848,40 @@ async def get_chart_data(
     if start_date and end_date:
         date_filter["date"] = {"$gte": start_date, "$lte": end_date}
     
-    all_transactions = await db.expenses.find(date_filter).to_list(1000)
-    
-    # Pie chart data - expenses by category
+    # Pie chart data - expenses by category, grouped server-side
+    category_cursor = await db.expenses.aggregate([
+        {"$match": date_filter},
+        {"$group": {"_id": {"type": "$type", "category": "$category"}, "total": {"$sum": "$amount"}}}
+    ])
+    category_rows = await category_cursor.to_list(1000)
+
     expense_categories = {}
     income_categories = {}
-    
-    for transaction in all_transactions:
-        category = transaction["category"]
-        amount = transaction["amount"]
-        
-        if transaction["type"] == "expense":
-            expense_categories[category] = expense_categories.get(category, 0) + amount
+    for row in category_rows:
+        if row["_id"]["type"] == "expense":
+            expense_categories[row["_id"]["category"]] = row["total"]
         else:
-            income_categories[category] = income_categories.get(category, 0) + amount
-    
-    # Bar chart data - daily/monthly spending
-    daily_spending = defaultdict(float)
-    daily_income = defaultdict(float)
-    
-    for transaction in all_transactions:
-        transaction_date = transaction["date"]
-        amount = transaction["amount"]
-        
-        if transaction["type"] == "expense":
-            daily_spending[transaction_date] += amount
+            income_categories[row["_id"]["category"]] = row["total"]
+
+    # Bar chart data - daily/monthly spending, grouped and sorted server-side
+    daily_cursor = await db.expenses.aggregate([
+        {"$match": date_filter},
+        {"$group": {"_id": {"type": "$type", "date": "$date"}, "total": {"$sum": "$amount"}}},
+        {"$sort": {"_id.date": 1}}
+    ])
+    daily_rows = await daily_cursor.to_list(1000)
+
+    daily_spending = {}
+    daily_income = {}
+    sorted_dates = []
+    for row in daily_rows:
+        row_date = row["_id"]["date"]
+        if not sorted_dates or sorted_dates[-1] != row_date:
+            sorted_dates.append(row_date)
+        if row["_id"]["type"] == "expense":
+            daily_spending[row_date] = row["total"]
         else:
-            daily_income[transaction_date] += amount
-    
-    # Sort by date
-    sorted_dates = sorted(set(list(daily_spending.keys()) + list(daily_income.keys())))
+            daily_income[row_date] = row["total"]
     
     return {
         "pie_chart": {
@@ -705,25 +920,28 @@ async def generate_report(
     if start_date and end_date:
         date_filter["date"] = {"$gte": start_date, "$lte": end_date}
     
-    all_transactions = await db.expenses.find(date_filter).sort("date", -1).to_list(1000)
-    
-    # Calculate summary statistics
-    total_expenses = sum(t["amount"] for t in all_transactions if t["type"] == "expense")
-    total_income = sum(t["amount"] for t in all_transactions if t["type"] == "income")
-    balance = total_income - total_expenses
-    
-    # Category breakdown
+    all_transactions = await db.expenses.find(date_filter, {"_id": 0}).sort("date", -1).to_list(1000)
+
+    # Summary statistics and category breakdown in one pass over the docs
+    total_expenses = 0.0
+    total_income = 0.0
     category_stats = {}
     for transaction in all_transactions:
         category = transaction["category"]
-        transaction_type = transaction["type"]
         amount = transaction["amount"]
-        
+
         if category not in category_stats:
             category_stats[category] = {"expenses": 0, "income": 0, "transactions": 0}
-        
-        category_stats[category][transaction_type] += amount
+
+        if transaction["type"] == "expense":
+            total_expenses += amount
+            category_stats[category]["expenses"] += amount
+        else:
+            total_income += amount
+            category_stats[category]["income"] += amount
         category_stats[category]["transactions"] += 1
+
+    balance = total_income - total_expenses
     
     # Top categories by spending
     top_expense_categories = sorted(
@@ -741,7 +959,7 @@ async def generate_report(
         },
         "category_breakdown": category_stats,
         "top_expense_categories": top_expense_categories,
-        "transactions": [Expense(**t) for t in all_transactions],
+        "transactions": all_transactions,
         "generated_at": datetime.utcnow().isoformat()
     }
 
@@ -761,60 +979,79 @@ async def export_transactions(
     if start_date and end_date:
         date_filter["date"] = {"$gte": start_date, "$lte": end_date}
     
-    transactions = await db.expenses.find(date_filter).sort("date", -1).to_list(1000)
-    
     if format.lower() == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(["Date", "Title", "Category", "Type", "Amount", "Description"])
-        
-        # Write transactions
-        for transaction in transactions:
-            writer.writerow([
-                transaction["date"],
-                transaction["title"],
-                transaction["category"],
-                transaction["type"],
-                transaction["amount"],
-                transaction.get("description", "")
-            ])
-        
-        output.seek(0)
-        content = output.getvalue()
-        output.close()
-        
+        # Only pull the columns the CSV actually contains
+        cursor = db.expenses.find(date_filter, {
+            "date": 1, "title": 1, "category": 1, "type": 1,
+            "amount": 1, "description": 1, "_id": 0
+        }).sort("date", -1)
+
+        async def generate_csv():
+            # Reuse one small buffer and yield rows as the cursor produces
+            # them, so memory stays flat regardless of export size
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+
+            # Write header
+            writer.writerow(["Date", "Title", "Category", "Type", "Amount", "Description"])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+            # Write transactions
+            async for transaction in cursor:
+                writer.writerow([
+                    transaction["date"],
+                    transaction["title"],
+                    transaction["category"],
+                    transaction["type"],
+                    transaction["amount"],
+                    transaction.get("description", "")
+                ])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+
         filename = f"expense_report_{start_date}_to_{end_date}.csv"
-        
+
         return StreamingResponse(
-            io.BytesIO(content.encode()),
+            generate_csv(),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
-    
+
     elif format.lower() == "json":
-        report_data = {
-            "report_period": f"{start_date} to {end_date}",
-            "exported_at": datetime.utcnow().isoformat(),
-            "transactions": transactions
-        }
-        
+        cursor = db.expenses.find(date_filter, {"_id": 0}).sort("date", -1)
+
+        async def generate_json():
+            yield (
+                f'{{"report_period": "{start_date} to {end_date}", '
+                f'"exported_at": "{datetime.utcnow().isoformat()}", '
+                '"transactions": ['
+            ).encode('utf-8')
+            first = True
+            async for transaction in cursor:
+                yield (b"" if first else b",") + orjson.dumps(transaction, default=str)
+                first = False
+            yield b"]}"
+
         filename = f"expense_report_{start_date}_to_{end_date}.json"
-        content = json.dumps(report_data, indent=2, default=str)
-        
+
         return StreamingResponse(
-            io.BytesIO(content.encode()),
+            generate_json(),
             media_type="application/json",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
-    
+
     else:
         raise HTTPException(status_code=400, detail="Unsupported format. Use 'csv' or 'json'")
 
 # Include the router in the main app
 app.include_router(api_router)
 
+# Analytics/report JSON is highly repetitive; gzip anything over 1KB
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -830,6 +1067,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_db_indexes():
+    # Compound indexes covering the hot query shapes so reads hit index
+    # seeks instead of collection scans
+    await db.expenses.create_index([("user_id", 1), ("date", -1), ("id", -1)])
+    await db.expenses.create_index([("user_id", 1), ("category", 1), ("type", 1), ("date", 1)])
+    await db.budgets.create_index([("user_id", 1), ("is_active", 1)])
+    await db.budget_alerts.create_index([("budget_id", 1), ("alert_type", 1), ("created_at", -1)])
+    await db.users.create_index([("username", 1)], unique=True)
+    await db.custom_categories.create_index([("user_id", 1), ("name", 1)], unique=True)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await client.close()
\ No newline at end of file
@@ -989,6 +989,7 @@ const ReportsSection = () => {
 const Dashboard = () => {
   const { user, logout } = useAuth();
   const [expenses, setExpenses] = useState([]);
+  const [expensesCursor, setExpensesCursor] = useState(null);
   const [categories, setCategories] = useState({ predefined: [], custom: [], all: [] });
   const [summary, setSummary] = useState({});
   const [showAddExpense, setShowAddExpense] = useState(false);
@@ -997,14 +998,16 @@ const Dashboard = () => {
   const [activeTab, setActiveTab] = useState('overview');
   const [period, setPeriod] = useState('month');
 
-  const fetchExpenses = async () => {
+  const fetchExpenses = async (cursor = null) => {
     try {
       const params = new URLSearchParams();
       if (filter.category) params.append('category', filter.category);
       if (filter.type) params.append('type', filter.type);
-      
+      if (cursor) params.append('cursor', cursor);
+
       const response = await axios.get(`${API}/expenses?${params}`);
-      setExpenses(response.data);
+      setExpenses(prev => cursor ? [...prev, ...response.data.items] : response.data.items);
+      setExpensesCursor(response.data.next_cursor);
     } catch (error) {
       console.error('Error fetching expenses:', error);
     }
@@ -1225,6 +1228,16 @@ const Dashboard = () => {
                   </div>
                 )}
               </div>
+              {expensesCursor && (
+                <div className="px-6 py-4 border-t border-gray-200 text-center">
+                  <button
+                    onClick={() => fetchExpenses(expensesCursor)}
+                    className="text-blue-600 hover:text-blue-800 font-medium transition"
+                  >
+                    Load More
+                  </button>
+                </div>
+              )}
             </div>
           </div>
         )}